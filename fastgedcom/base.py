@@ -42,6 +42,8 @@ class Line(ABC):
     Implementations are :py:class:`.TrueLine` and :py:class:`.FakeLine`,
     see these classes for more information.
     """
+    __slots__ = ()  # otherwise, subclasses instances would still have a __dict__
+
     @abstractmethod
     def __bool__(self) -> bool:
         """True if it is a :py:class:`.TrueLine`,
@@ -107,20 +109,22 @@ class Line(ABC):
         """Recursively iterate on sub-lines.
         All lines under the given line are returned. The order is preserved
         as in the gedcom file, sub-sub-lines come before siblings lines."""
-        lines = self.sub_lines.copy()
-        while len(lines) > 0:
-            line = lines.pop(0)
+        # Stack of the lines to visit, the next one is at the end
+        lines = self.sub_lines[::-1]
+        while lines:
+            line = lines.pop()
             yield line
-            lines = line.sub_lines + lines
+            if line.sub_lines:
+                lines.extend(reversed(line.sub_lines))
 
     def get_source(self) -> str:
         """Return the gedcom text equivalent for the line and its sub-lines."""
         if not self:
             return ""
-        text = str(self) + "\n"
-        for sub_line in self.get_all_sub_lines():
-            text += str(sub_line) + "\n"
-        return text
+        lines = [str(self)]
+        lines.extend(map(str, self.get_all_sub_lines()))
+        lines.append("")  # for the final newline
+        return "\n".join(lines)
 
 
 class FakeLine(Line):
@@ -137,6 +141,8 @@ class FakeLine(Line):
     :py:class:`.TrueLine` a simple boolean test is enough.
     """
 
+    __slots__ = ()
+
     payload = ""  # pyright: ignore[reportGeneralTypeIssues]
     payload_with_cont = ""  # pyright: ignore[reportGeneralTypeIssues]
     sub_lines = []  # pyright: ignore[reportGeneralTypeIssues]
@@ -249,13 +255,14 @@ class TrueLine(Line):
 
     @property
     def payload_with_cont(self) -> str:
-        text = self.payload
+        parts = [self.payload]
         for sub_line in self.sub_lines:
             if sub_line.tag == "CONT":
-                text += '\n' + sub_line.payload
+                parts.append('\n')
+                parts.append(sub_line.payload)
             elif sub_line.tag == "CONC":
-                text += sub_line.payload
-        return text
+                parts.append(sub_line.payload)
+        return "".join(parts)
 
 
 Record: TypeAlias = TrueLine
@@ -326,13 +333,12 @@ class Document():
             [<TrueLine 0 @I2@ INDI -> 0>],
         ]
         """
-        def all_lines_rec(path: list[TrueLine]) -> Iterator[list[TrueLine]]:
+        # depth-first traversal with an explicit stack of paths, in reverse order
+        paths = [[record] for record in reversed(self.records.values())]
+        while paths:
+            path = paths.pop()
             yield path
-            for subline in path[-1].sub_lines:
-                yield from all_lines_rec(path + [subline])
-
-        for record in self.records.values():
-            yield from all_lines_rec([record])
+            paths.extend(path + [sub_line] for sub_line in reversed(path[-1].sub_lines))
 
     def __eq__(self, __value: object) -> bool:
         if not isinstance(__value, Document):
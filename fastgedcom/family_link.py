@@ -16,12 +16,14 @@ class FamilyLink():
     :py:meth:`.get_children`). Use the first set of methods when
     you need performance. Use the second set of methods for convenience.
 
-    The class uses 2 dictionnaries to store family relations:
+    The class uses 3 dictionnaries to store family relations:
 
     - The `parents` dictionnary is used to get the parents of someone
     (via the FAMC of the person).
     - The `unions` dictionnary is used to get the spouses or children
     (via the FAMS of the person).
+    - The `children` dictionnary is used to get the children of a family
+    (via the CHIL of the family).
     Not all methods use those dictionnaries,
     for example the get_parent_family_ref doesn't.
     """
@@ -30,11 +32,13 @@ class FamilyLink():
         self.document = document
         self.parents: dict[IndiRef, tuple[Record | FakeLine, Record | FakeLine]] = dict()
         self.unions: defaultdict[IndiRef, list[Record]] = defaultdict(list)
+        self.children: dict[FamRef, list[IndiRef]] = dict()
         self._build_dicts()
 
     def _build_dicts(self) -> None:
         self.parents.clear()
         self.unions.clear()
+        self.children.clear()
         for fam_record in self.document.records.values():
             if fam_record.payload != "FAM":
                 continue
@@ -54,6 +58,7 @@ class FamilyLink():
                     self.unions[mother.tag].append(fam_record)
             for child in children:
                 self.parents[child] = (father, mother)
+            self.children[fam_record.tag] = children
 
     def get_parent_family_ref(self, child: TrueLine | FakeLine) -> FamRef | None:
         """Return the family reference with the parents of the person."""
@@ -97,9 +102,7 @@ class FamilyLink():
     def get_children_ref(self, parent: IndiRef) -> list[IndiRef]:
         """Return the children's references of a person."""
         unions = self.unions.get(parent, [])
-        return [sub_line.payload
-                for fam in unions for sub_line in fam.sub_lines
-                if sub_line.tag == "CHIL" and sub_line.payload != "@VOID@"]
+        return [child for fam in unions for child in self.children[fam.tag]]
 
     def get_children(self, parent: IndiRef) -> list[Record]:
         """Return the children's records of a person."""
@@ -113,9 +116,7 @@ class FamilyLink():
         """Return the children's references of the couple."""
         fams = self.unions.get(spouse1, [])
         unions = [fam for fam in self.unions.get(spouse2, []) if fam in fams]
-        return [sub_line.payload
-                for fam in unions for sub_line in fam.sub_lines
-                if sub_line.tag == "CHIL" and sub_line.payload != "@VOID@"]
+        return [child for fam in unions for child in self.children[fam.tag]]
 
     def get_children_with(self,
                           spouse1: IndiRef,
@@ -140,18 +141,15 @@ class FamilyLink():
     def get_all_siblings_ref(self, indi: IndiRef) -> list[IndiRef]:
         """Return the siblings' references of the person.
         Stepsiblings included."""
-        father, mother = self.get_parents(indi)
-        unions: list[Record] = []
-        if father:
-            unions.extend(self.unions.get(father.tag, []))
-        if mother:
-            unions.extend(u for u in self.unions.get(mother.tag, [])
-                          if u not in unions)  # remove duplicates
-        return [sub_line.payload
-                for fam in unions
-                for sub_line in fam.sub_lines
-                if (sub_line.tag == "CHIL" and sub_line.payload != "@VOID@"
-                    and sub_line.payload != indi)]
+        # dict keys remove duplicates while keeping the order
+        fam_refs = dict.fromkeys(fam.tag
+                                 for parent in self.get_parents(indi) if parent
+                                 for fam in self.unions.get(parent.tag, []))
+        siblings = dict.fromkeys(child
+                                 for fam_ref in fam_refs
+                                 for child in self.children[fam_ref])
+        siblings.pop(indi, None)
+        return list(siblings)
 
     def get_all_siblings(self, indi: IndiRef) -> list[Record]:
         """Return the siblings' records of the person.
@@ -162,11 +160,10 @@ class FamilyLink():
     def get_siblings_ref(self, indi: IndiRef) -> list[IndiRef]:
         """Return the siblings' references of the person.
         Stepsiblings excluded."""
-        fam = self.get_parent_family(self.document.records[indi])
-        return [sub_line.payload
-                for sub_line in fam.sub_lines
-                if (sub_line.tag == "CHIL" and sub_line.payload != "@VOID@"
-                    and sub_line.payload != indi)]
+        fam_ref = self.get_parent_family_ref(self.document.records[indi])
+        if fam_ref is None:
+            return []
+        return [child for child in self.children.get(fam_ref, []) if child != indi]
 
     def get_siblings(self, indi: IndiRef) -> list[Record]:
         """Return the siblings' records of the person.
@@ -187,9 +184,7 @@ class FamilyLink():
         stepsiblings: list[IndiRef] = []
         for fam in unions:
             if fam.tag != parent_fam:
-                stepsiblings.extend(sub_line.payload
-                                    for sub_line in fam.sub_lines
-                                    if sub_line.tag == "CHIL" and sub_line.payload != "@VOID@")
+                stepsiblings.extend(self.children[fam.tag])
         return stepsiblings
 
     def get_stepsiblings(self, indi: IndiRef) -> list[Record]:
@@ -296,12 +291,10 @@ class FamilyLink():
 
     def get_by_degree_ref(self, indi: IndiRef, degree: int) -> list[IndiRef]:
         """Return relatives having that degree of kinship with the person."""
-        return [p for ascent in range(degree+1) for descent in range(degree+1)
-                for p in self.traverse_ref(indi, ascent, descent)
-                if ascent + descent == degree]
+        return [p for ascent in range(degree+1)
+                for p in self.traverse_ref(indi, ascent, degree - ascent)]
 
     def get_by_degree(self, indi: IndiRef, degree: int) -> list[Record]:
         """Return relatives having that degree of kinship with the person."""
-        return [p for ascent in range(degree+1) for descent in range(degree+1)
-                for p in self.traverse(indi, ascent, descent)
-                if ascent + descent == degree]
+        return [p for ascent in range(degree+1)
+                for p in self.traverse(indi, ascent, degree - ascent)]
@@ -1,8 +1,10 @@
 """Utilitary functions to sort, format, or extract information."""
+import re
 import warnings
 from typing import Iterator, overload
 from datetime import datetime, time
 from enum import Enum
+from functools import lru_cache
 
 from .base import FakeLine, TrueLine
 
@@ -113,19 +115,29 @@ def get_date_type(date: str) -> DateType | None:
     return None
 
 
+_LEADING_ZEROS = re.compile(r"(?<![^\s-])0+(?!\Z)")
+"""Zeros at the start of a word or after a minus sign, except the last
+character of the string."""
+
+
 def remove_trailing_zeros(date: str) -> str:
     """Removes useless 0 prefixing numbers."""
-    k = 0
-    while k+1 < len(date):
-        if date[k] != '0':
-            k += 1
-        elif k == 0 or date[k-1].isspace() or date[k-1] == '-':
-            date = date[:k] + date[k+1:]
-        else:
-            k += 1
-    return date
+    return _LEADING_ZEROS.sub("", date)
 
 
+_DATE_MODIFIER_SYMBOLS = {
+    'ABT': '~ ',
+    'CAL': '~ ',
+    'EST': '~ ',
+    'BEF': '< ',
+    'AFT': '> ',
+    'FROM': '',
+    'TO': '',
+}
+"""Replacements of the date modifiers prefixing a date in :py:func:`format_date`."""
+
+
+@lru_cache(maxsize=4096)
 def format_date(date: str) -> str:
     """Format the payload of DATE lines.
     Return a short string representation of the date by
@@ -146,14 +158,15 @@ def format_date(date: str) -> str:
     * :py:attr:`FROM_TO` is replaced by `--`.
     """
     date = remove_trailing_zeros(date)
-    if date[:4] == 'BET ' and 'AND' in date:
-        date = date[4:]
-        date1, date2 = date.split(' AND ', 1)
-        return format_date(date1) + ' -- ' + format_date(date2)
-    elif date[:5] == 'FROM ' and 'TO' in date:
-        date = date[5:]
-        date1, date2 = date.split(' TO ', 1)
-        return format_date(date1) + ' -- ' + format_date(date2)
+    modifier, _, dates = date.partition(' ')
+    if modifier == 'BET':
+        date1, separator, date2 = dates.partition(' AND ')
+        if separator:
+            return format_date(date1) + ' -- ' + format_date(date2)
+    elif modifier == 'FROM':
+        date1, separator, date2 = dates.partition(' TO ')
+        if separator:
+            return format_date(date1) + ' -- ' + format_date(date2)
     if date[-3:] == ' BC' or date[-4:] == ' BCE':
         date_parts = date.split(' ')
         year = date_parts[-2]
@@ -162,19 +175,14 @@ def format_date(date: str) -> str:
             date = date_without_year + ' -' + year
         else:
             date = '-' + year
-    if date[:4] in ('ABT ', 'CAL ', 'EST '):
-        date = '~ '+date[4:]
-    elif date[:4] == 'BEF ':
-        date = '< '+date[4:]
-    elif date[:4] == 'AFT ':
-        date = '> '+date[4:]
-    elif date[:5] == 'FROM ':
-        date = date[5:]
-    elif date[:3] == 'TO ':
-        date = date[3:]
+    modifier, separator, rest = date.partition(' ')
+    symbol = _DATE_MODIFIER_SYMBOLS.get(modifier)
+    if separator and symbol is not None:
+        date = symbol + rest
     return date
 
 
+@lru_cache(maxsize=4096)
 def extract_year(date: str) -> str:
     """Format the payload of DATE lines.
 
@@ -220,11 +228,20 @@ def extract_int_year(date: str, default: float | None = None) -> float | None:
     A :py:attr:`BCE` date returns a negative number. For :py:attr:`BET_AND` and
     :py:attr:`FROM_TO` date types, this function returns the median number of
     the range, hence the float type."""
+    year = _extract_int_year(date)
+    if year is None:
+        return default
+    return year
+
+
+@lru_cache(maxsize=4096)
+def _extract_int_year(date: str) -> float | None:
+    """Implementation of :py:func:`extract_int_year`, without default to be cached."""
     year = extract_year(date)
     if ' -- ' in year:
         str_year1, str_year2 = year.split(' -- ', 1)
-        year1 = extract_int_year(str_year1)
-        year2 = extract_int_year(str_year2)
+        year1 = _extract_int_year(str_year1)
+        year2 = _extract_int_year(str_year2)
         if year1 is None:
             return year2
         elif year2 is None:
@@ -232,10 +249,19 @@ def extract_int_year(date: str, default: float | None = None) -> float | None:
         return (year1 + year2) / 2
     year_without_context = ''.join(filter(lambda c: c.isdecimal() or c == '-', year))
     if year_without_context == "":
-        return default
+        return None
     return int(year_without_context)
 
 
+_MONTHS = {
+    month: number for number, month in enumerate(
+        ("JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"),
+        start=1,
+    )
+}
+"""Month numbers by month abbreviations of the gedcom standard."""
+
+
 def to_datetime(date: str, default: datetime | None = None) -> datetime:
     """Convert the payload of DATE lines to datetime object.
 
@@ -250,21 +276,37 @@ def to_datetime(date: str, default: datetime | None = None) -> datetime:
     date types. For :py:attr:`BET_AND` or :py:attr:`TO_FROM` date types, use the
     :py:func:`.to_datetime_range` function. The :py:attr:`BEF` and :py:attr:`AFT`
     date types are not supported."""
-    if date[:4] in ("ABT ", "CAL ", "EST "):
-        date = date[4:]
-    year = extract_int_year(date)
-    if year and 0 < year < 1000:
-        four_digits_year = f"{year:04}"
-        date = date.replace(str(year), four_digits_year)
-    err = ValueError(f"Fail to parse {date} as a date")
-    for fmt in ("%d %b %Y", "%d %b %Y", "%b %Y", "%Y"):
-        try:
-            return datetime.strptime(date, fmt)
-        except ValueError as e:
-            err = e
+    parsed_date = _to_datetime(date)
+    if parsed_date is not None:
+        return parsed_date
     if default is not None:
         return default
-    raise err
+    raise ValueError(f"Fail to parse {date} as a date")
+
+
+@lru_cache(maxsize=4096)
+def _to_datetime(date: str) -> datetime | None:
+    """Implementation of :py:func:`to_datetime`, returning None on failure to be cached."""
+    date_parts = date.split()
+    if date_parts and date_parts[0] in ("ABT", "CAL", "EST"):
+        del date_parts[0]
+    if not 1 <= len(date_parts) <= 3:
+        return None
+    year = date_parts[-1]
+    if not year.isdecimal() or len(year) > 4:
+        return None
+    month = 1
+    if len(date_parts) >= 2:
+        month = _MONTHS.get(date_parts[-2].upper(), 0)
+    day = "1"
+    if len(date_parts) == 3:
+        day = date_parts[0]
+        if not day.isdecimal() or len(day) > 2:
+            return None
+    try:
+        return datetime(int(year), month, int(day))
+    except ValueError:  # out of range value
+        return None
 
 
 def to_datetime_range(
@@ -280,15 +322,17 @@ def to_datetime_range(
     or :py:attr:`FROM_TO`.
 
     Call :py:func:`.to_datetime` on the first and second date."""
-    if date.startswith("BET ") and date.count(" AND ") == 1:
-        part1, part2 = date[4:].split(" AND ")
-    elif date.startswith("FROM ") and date.count(" TO ") == 1:
-        part1, part2 = date[5:].split(" TO ")
-    elif default is not None:
-        return default, default
+    if date.startswith("BET "):
+        parts = date[4:].split(" AND ")
+    elif date.startswith("FROM "):
+        parts = date[5:].split(" TO ")
     else:
+        parts = []
+    if len(parts) != 2:
+        if default is not None:
+            return default, default
         raise ValueError(f"Fail to parse {date} as a date range")
-    return to_datetime(part1, default), to_datetime(part2, default)
+    return to_datetime(parts[0], default), to_datetime(parts[1], default)
 
 
 def add_time(date: datetime, time_: str) -> datetime:
@@ -297,6 +341,8 @@ def add_time(date: datetime, time_: str) -> datetime:
     Otherwise, return the datetime as it was.
 
     Note: datetime is immutable, thus the presence of a returned value."""
+    if not time_:  # no TIME line, avoid raising and catching a ValueError
+        return date
     try:
         t = time.fromisoformat(time_)
     except ValueError:
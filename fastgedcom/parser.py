@@ -4,11 +4,15 @@ On module import, register the ansel and gedcom codecs from the `ansel python li
 <https://pypi.org/project/ansel/>`_.
 """
 
-from typing import Iterable
+from typing import IO, Iterable, Iterator, TypeAlias
 from dataclasses import dataclass
-from pathlib import Path
+from os import PathLike
+from sys import intern
 
-from .base import Document, TrueLine, XRef
+from .base import Document, Record, TrueLine, XRef
+
+FilePath: TypeAlias = str | bytes | PathLike[str] | PathLike[bytes]
+"""A path to a file, as accepted by :py:func:`open`."""
 
 try:
     import ansel  # type: ignore
@@ -65,6 +69,114 @@ class CharacterInsteadOfLineWarning(ParsingWarning):
     line_number: int
 
 
+_LEVELS = {str(level): level for level in range(32)}
+"""Usual line levels, to avoid calling int() on each line."""
+
+
+def iter_records(
+    lines: Iterable[str],
+    warnings: list[ParsingWarning] | None = None,
+) -> Iterator[Record]:
+    """Parse the text input and yield the records one by one.
+
+    A record (a level 0 line) is yielded once all its sub-lines are parsed,
+    i.e. when the next level 0 line is read or at the end of the input.
+    Contrary to :py:func:`.parse`, the records are not kept, so only one
+    record at a time needs to be in memory if the caller doesn't store them.
+
+    The :py:class:`.ParsingWarning` encountered are appended to ``warnings``.
+    See :py:func:`.parse` for the handling of malformed lines.
+    """
+    if warnings is None:
+        warnings = []
+    seen_xrefs: set[XRef] = set()
+    # pool sharing a single string per xref between records and pointers, freed with the document
+    xrefs: dict[str, str] = {}
+    record: Record | None = None
+    # parent_lines[:depth] are the lines that can receive the next sub-line, by increasing level,
+    # the others are kept to be overwritten. In a well-formed gedcom, parent_lines[i] has level i.
+    parent_lines: list[TrueLine] = []
+    depth = 0
+    # local names avoid attribute lookups in the loop
+    add_warning = warnings.append
+    get_level = _LEVELS.get
+    for line_number, line in enumerate(lines, 1):
+        # only strip the line ending, trailing spaces can be part of a text continued by CONC
+        line_info = line.rstrip('\r\n').split(' ', 2)
+        if len(line_info) == 1:
+            if line_info[0] == "" or line.isspace():
+                add_warning(EmptyLineWarning(line_number))
+                continue
+            if len(line) == 1:
+                add_warning(CharacterInsteadOfLineWarning(line_number))
+                break
+            add_warning(LineParsingWarning(line_number, line))
+            continue
+        if line.isspace():
+            add_warning(EmptyLineWarning(line_number))
+            continue
+        if line_info[1] == "":
+            # no tag, e.g. a single word followed by trailing spaces
+            add_warning(LineParsingWarning(line_number, line))
+            continue
+        level = get_level(line_info[0])
+        if level is None:
+            try:
+                level = int(line_info[0])
+            except ValueError:
+                add_warning(LevelParsingWarning(line_number, line))
+                continue
+        # the same few tags are repeated on most sub-lines, share a single string for each.
+        # The tags of level 0 lines are mostly unique xrefs, interning them would keep them forever.
+        tag = intern(line_info[1]) if level else xrefs.setdefault(line_info[1], line_info[1])
+        if len(line_info) == 3:
+            payload = line_info[2]
+            if payload.startswith("@"):
+                stripped = payload.rstrip()
+                if stripped.endswith("@"):
+                    # pointers to records, share a single string with the record xref
+                    payload = xrefs.setdefault(stripped, stripped)
+            elif level == 0 and payload[-1:].isspace():
+                stripped = payload.rstrip()
+                if " " not in stripped:  # only the record type, e.g. "FAM "
+                    payload = stripped
+            parsed_line = TrueLine(level, tag, payload, [])
+        else:
+            parsed_line = TrueLine(level, tag, "", [])
+        if level == 0:
+            if parsed_line.tag in seen_xrefs:
+                add_warning(DuplicateXRefWarning(parsed_line.tag))
+            else:
+                seen_xrefs.add(parsed_line.tag)
+            if record is not None:
+                yield record
+            record = parsed_line
+            depth = 0
+        elif level < 0 or depth == 0:
+            depth = 0
+            add_warning(LevelInconsistencyWarning(line_number, line))
+            continue
+        else:
+            if level <= depth and parent_lines[level-1].level == level - 1:
+                # usual case: the parent is at the index of its level
+                depth = level
+            else:
+                # skipped levels: the parent is the deepest line of lower level
+                while parent_lines[depth-1].level >= level:
+                    depth -= 1
+            parent = parent_lines[depth-1]
+            if parent.level + 1 != level:
+                add_warning(LevelInconsistencyWarning(line_number, line))
+            parent.sub_lines.append(parsed_line)
+        if depth < len(parent_lines):
+            parent_lines[depth] = parsed_line
+        else:
+            parent_lines.append(parsed_line)
+        depth += 1
+    if record is not None:
+        yield record
+
+
 def parse(lines: Iterable[str]) -> tuple[Document, list[ParsingWarning]]:
     """Parse the text input to create a
     :py:class:`.Document` object.
@@ -78,50 +190,17 @@ def parse(lines: Iterable[str]) -> tuple[Document, list[ParsingWarning]]:
 
     Return the :py:class:`.Document` and the list of :py:class:`.ParsingWarning`
     encountered.
+
+    To process large files record by record, use :py:func:`.iter_records`.
     """
     document = Document()
     warnings: list[ParsingWarning] = []
-    line_number = 0
-    parent_lines: list[TrueLine] = []
-    for line in lines:
-        line_number += 1
-        line_info = line.rstrip().split(' ', 2)
-        try:
-            if len(line_info) == 3:
-                parsed_line = TrueLine(int(line_info[0]), line_info[1], line_info[2], [])
-            elif len(line_info) == 2:
-                parsed_line = TrueLine(int(line_info[0]), line_info[1], "", [])
-            elif line_info == [""]:
-                warnings.append(EmptyLineWarning(line_number))
-                continue
-            else:
-                if len(line) == 1:
-                    warnings.append(CharacterInsteadOfLineWarning(line_number))
-                    break
-                warnings.append(LineParsingWarning(line_number, line))
-                continue
-        except ValueError:
-            warnings.append(LevelParsingWarning(line_number, line))
-            continue
-        if parsed_line.level == 0:
-            parent_lines = [parsed_line]
-            if parsed_line.tag in document.records:
-                warnings.append(DuplicateXRefWarning(parsed_line.tag))
-            document.records[parsed_line.tag] = parsed_line
-        else:
-            while parent_lines and parsed_line.level <= parent_lines[-1].level:
-                parent_lines.pop(-1)
-            if len(parent_lines) == 0:
-                warnings.append(LevelInconsistencyWarning(line_number, line))
-            else:
-                if (parent_lines[-1].level + 1 != parsed_line.level):
-                    warnings.append(LevelInconsistencyWarning(line_number, line))
-                parent_lines[-1].sub_lines.append(parsed_line)
-                parent_lines.append(parsed_line)
+    for record in iter_records(lines, warnings):
+        document.records[record.tag] = record
     return (document, warnings)
 
 
-def guess_encoding(file: str | Path) -> str | None:
+def guess_encoding(file: FilePath) -> str | None:
     """Return the guessed encoding of the ``file``. None if unknown.
 
     A gedcom should precise its encoding in the header under the tag CHAR.
@@ -158,28 +237,38 @@ def guess_encoding(file: str | Path) -> str | None:
         # UTF-16, big-endian
         # With "utf_16", Python removes the BOM mark when reading the file.
         return "utf_16"
-    # Try non-utf encodings and loog at the 0 HEAD > 1 CHAR gedcom field
-    encodings = (
-        "utf-8",
-        "ansel" if IS_ANSEL_INSTALLED else None,
-        "iso8859-1",
-    )
-    for encoding in encodings:
-        if encoding is None:
-            continue
-        try:
-            with open(file, "r", encoding=encoding) as f:
-                for line in f:
-                    if line.startswith("1 CHAR "):
-                        stated_encoding = line[7:-1].lower()
-                        if stated_encoding == "ansel":
-                            return "gedcom"
-                        return stated_encoding
-        except UnicodeError:
-            pass
+    # For non-utf encodings, look at the 0 HEAD > 1 CHAR gedcom field.
+    # Its tags and value are ASCII, so there is no need to decode the file.
+    for line in _iter_header_lines(file):
+        if line.startswith(b"1 CHAR "):
+            stated_encoding = line[7:].strip().decode("latin-1").lower()
+            if stated_encoding == "ansel":
+                return "gedcom"
+            return stated_encoding
     return None
 
 
+def _iter_header_lines(file: FilePath) -> Iterator[bytes]:
+    """Yield the undecoded lines of the gedcom header, without line endings.
+
+    The file is read by blocks and the reading stops at the first record
+    after the header."""
+    with open(file, "rb") as f:
+        in_header = False  # True once the level 0 line of the header is read
+        remainder = b""
+        while block := f.read(4096):
+            lines = (remainder + block).splitlines(keepends=True)
+            remainder = lines.pop()  # the last line may continue in the next block
+            for line in lines:
+                if line.startswith(b"0 "):
+                    if in_header:
+                        return
+                    in_header = True
+                yield line.rstrip(b"\r\n")
+        if remainder and not (in_header and remainder.startswith(b"0 ")):
+            yield remainder.rstrip(b"\r\n")
+
+
 class ParsingError(Exception):
     """Error raise by :py:func:`.strict_parse`."""
 
@@ -194,15 +283,21 @@ class MalformedError(ParsingError):
     warnings: list[ParsingWarning]
 
 
-def strict_parse(file: str | Path) -> Document:
+def strict_parse(file: FilePath | IO[str]) -> Document:
     """Open and parse the gedcom file.
     Return the :py:class:`.Document` representing the gedcom file.
 
+    The ``file`` is either a path, opened with the encoding given by
+    :py:func:`.guess_encoding`, or an already opened text stream.
+
     Raise :py:exc:`.NothingParsed` when the input is empty or isn't gedcom.
     Raise :py:exc:`.MalformedError` when an error occurs in the parsing process.
     """
-    with open(file, "r", encoding=guess_encoding(file)) as f:
-        document, warnings = parse(f)
+    if isinstance(file, (str, bytes, PathLike)):
+        with open(file, "r", encoding=guess_encoding(file)) as f:
+            document, warnings = parse(f)
+    else:
+        document, warnings = parse(file)
     if warnings:
         raise MalformedError(warnings)
     if len(document.records) == 0:
@@ -1,3 +1,4 @@
+import pickle
 import unittest
 
 from fastgedcom.base import Document, TrueLine, fake_line
@@ -81,6 +82,17 @@ class TestTrueLine(unittest.TestCase):
         ])
         self.assertEqual(note_line3.payload_with_cont, note_text3)
 
+    def test_no_instance_dict(self) -> None:
+        line = TrueLine(1, "NOTE", "text")
+        self.assertFalse(hasattr(line, "__dict__"))
+        with self.assertRaises(AttributeError):
+            line.note = "text"  # type: ignore[attr-defined]
+
+    def test_pickle(self) -> None:
+        name = TrueLine(1, "NAME", "éàç /ÉÀÇ/", [TrueLine(2, "SURN", "ÉÀÇ")])
+        indi = TrueLine(0, "@I1@", "INDI", [name, TrueLine(1, "SEX", "U")])
+        self.assertEqual(pickle.loads(pickle.dumps(indi)), indi)
+
 
 class TestFakeLine(unittest.TestCase):
     def test_get_sub_line(self) -> None:
@@ -107,6 +119,9 @@ class TestFakeLine(unittest.TestCase):
     def test_payload_with_cont(self) -> None:
         self.assertEqual(fake_line.payload_with_cont, "")
 
+    def test_no_instance_dict(self) -> None:
+        self.assertFalse(hasattr(fake_line, "__dict__"))
+
 
 class TestDocument(unittest.TestCase):
     def test_contains(self) -> None:
@@ -37,6 +37,8 @@ class TestDateHelpers(unittest.TestCase):
         self.assertEqual(format_date('BET 22 May 67 AND 1 Apr 67'), '22 May 67 -- 1 Apr 67')
         self.assertEqual(format_date('FROM 62 BC TO 64 BC'), '-62 -- -64')
         self.assertEqual(format_date("FROM 16 Feb 1546/1547"), "16 Feb 1546/1547")
+        self.assertEqual(format_date("FROM 1900 (TOULOUSE)"), "1900 (TOULOUSE)")
+        self.assertEqual(format_date("BET 1900 (ANDORRA)"), "BET 1900 (ANDORRA)")
 
     def test_format_date_stability(self) -> None:
         dates = ('22 Mar 2001', '2001', '12 Fev 67 BCE', 'ABT 22 Mar 2001',
@@ -90,6 +92,11 @@ class TestDateHelpers(unittest.TestCase):
         self.assertRaises(ValueError, to_datetime, 'BET 2001 AND 2002')
         self.assertRaises(ValueError, to_datetime, 'FROM 1 Jan 2001 TO 31 Dec 2002')
         self.assertRaises(ValueError, to_datetime, "FROM 16 Feb 1546/1547")
+        self.assertEqual(to_datetime('22 MAR 2001'), datetime(2001, 3, 22))
+        self.assertEqual(to_datetime('CAL FEB 1546'), datetime(1546, 2, 1))
+        self.assertEqual(to_datetime('2 Mar 2'), datetime(2, 3, 2))
+        self.assertRaises(ValueError, to_datetime, '31 Feb 2001')
+        self.assertRaises(ValueError, to_datetime, '1 Fev 2001')
 
     def test_to_datetime_range(self) -> None:
         self.assertRaises(ValueError, to_datetime_range, "")
@@ -107,6 +114,8 @@ class TestDateHelpers(unittest.TestCase):
                          (datetime(2001, 1, 1), datetime(2002, 12, 31)))
         self.assertRaises(ValueError, to_datetime_range, 'BET 62 BC AND 64 BC')
         self.assertRaises(ValueError, to_datetime_range, "FROM 16 Feb 1546/1547")
+        self.assertRaises(ValueError, to_datetime_range, "BET AND 1900")
+        self.assertEqual(to_datetime_range("BET AND 1900", datetime.min), (datetime.min, datetime.min))
 
     def test_add_time(self) -> None:
         self.assertEqual(
@@ -3,7 +3,7 @@ from pathlib import Path
 
 from fastgedcom.base import Document, fake_line
 from fastgedcom.family_link import FamilyLink
-from fastgedcom.parser import strict_parse
+from fastgedcom.parser import parse, strict_parse
 
 gedcom_file = Path(__file__).parent / "test_data" / "relatives.ged"
 
@@ -73,6 +73,10 @@ class TestFamilyLink(unittest.TestCase):
     def test_get_children(self) -> None:
         self.assertCountEqual(self.linker.get_children_ref("@I1@"), ["@I6@", "@I7@", "@I41@"])
 
+    def test_children_dict(self) -> None:
+        self.assertEqual(self.linker.children["@F3@"], ["@I7@", "@I41@"])
+        self.assertNotIn("@I1@", self.linker.children)
+
     def test_get_children_with(self) -> None:
         self.assertCountEqual(self.linker.get_children_with_ref("@I1@", "@I5@"), ["@I7@", "@I41@"])
 
@@ -81,6 +85,28 @@ class TestFamilyLink(unittest.TestCase):
         self.assertCountEqual(self.linker.get_stepsiblings_ref("@I7@"), ["@I6@"])
         self.assertCountEqual(self.linker.get_all_siblings_ref("@I7@"), ["@I6@", "@I41@"])
 
+    def test_all_siblings_without_duplicates(self) -> None:
+        document, _ = parse([
+            "0 @I1@ INDI", "1 FAMC @F1@",
+            "0 @I2@ INDI", "1 FAMS @F1@", "1 FAMS @F2@",
+            "0 @I3@ INDI", "1 FAMC @F1@", "1 FAMC @F2@",
+            "0 @F1@ FAM", "1 HUSB @I2@", "1 CHIL @I1@", "1 CHIL @I3@",
+            "0 @F2@ FAM", "1 HUSB @I2@", "1 CHIL @I3@",
+        ])
+        self.assertEqual(FamilyLink(document).get_all_siblings_ref("@I1@"), ["@I3@"])
+
+    def test_trailing_spaces(self) -> None:
+        document, warnings = parse([
+            "0 @I1@ INDI ", "1 FAMC @F1@ ",
+            "0 @I2@ INDI", "1 FAMS @F1@",
+            "0 @F1@ FAM ", "1 HUSB @I2@ ", "1 CHIL @I1@\t",
+        ])
+        self.assertEqual(warnings, [])
+        self.assertEqual([fam.tag for fam in document.get_records("FAM")], ["@F1@"])
+        linker = FamilyLink(document)
+        self.assertEqual(linker.get_parents("@I1@"), (document.records["@I2@"], fake_line))
+        self.assertEqual(linker.get_children_ref("@I2@"), ["@I1@"])
+
     def test_get_relatives(self) -> None:
         person_id = "@I1@"
         parents = self.linker.get_relatives_ref(person_id, 1)
@@ -1,14 +1,18 @@
 import unittest
-from io import StringIO
+from typing import Iterator
+from io import BytesIO, StringIO
+from os import scandir
 from pathlib import Path
-from sys import platform
-from unittest.mock import mock_open, patch
+from sys import intern, platform
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
 
+from fastgedcom.base import TrueLine
 from fastgedcom.parser import (
     IS_ANSEL_INSTALLED, CharacterInsteadOfLineWarning, DuplicateXRefWarning,
     EmptyLineWarning, LevelInconsistencyWarning, LevelParsingWarning,
-    LineParsingWarning, MalformedError, NothingParsedError, guess_encoding,
-    parse, strict_parse
+    LineParsingWarning, MalformedError, NothingParsedError, ParsingWarning,
+    guess_encoding, iter_records, parse, strict_parse
 )
 
 test_file_dir = Path(__file__).parent / "test_data"
@@ -40,152 +44,241 @@ gedcom_file_data = """0 HEAD
 3 TIME 20:51:21
 0 TRLR
 """
+_GEDCOM_LINES = tuple(gedcom_file_data.splitlines())
+
+_ENCODED_FILES: list[tuple[str, str, str | bytes, str | None]] = [
+    ("in_utf8.ged", "utf-8", "éàç /ÉÀÇ/", gedcom_file_data),
+    ("in_utf8_bom.ged", "utf-8-sig", "éàç /ÉÀÇ/", None),
+    ("in_unicode.ged", "utf_16", "éàç /ÉÀÇ/", None),
+    ("in_ansi.ged", "ansi", "éàç /ÉÀÇ/", None),
+    ("in_ansel.ged", "gedcom", b'\xe2e\xe1a\xf0c /\xe2E\xe1A\xf0C/', None),
+    ("in_iso8859-1.ged", "iso8859-1", "éàç /ÉÀÇ/", None),
+]
+"""Test files: name, encoding, NAME payload of @I1@ (undecoded if bytes), source if checked."""
+
+_FILE_BYTES = {file_name: (test_file_dir / file_name).read_bytes() for file_name, *_ in _ENCODED_FILES}
+"""Content of the test files, read once. Decoded in the tests, as some codecs may be unavailable."""
+
+
+class _ReadRecorder(BytesIO):
+    """In-memory binary file recording the size of each read."""
+
+    def __init__(self, data: bytes, read_sizes: list[int | None]) -> None:
+        super().__init__(data)
+        self.read_sizes = read_sizes
+
+    def read(self, size: int | None = -1, /) -> bytes:
+        self.read_sizes.append(size)
+        return super().read(size)
+
+
+def _src(text: str) -> StringIO:
+    """Return the gedcom text as a stream, as the parser gets from an open file."""
+    return StringIO(text)
+
+
+_WARNING_CASES: list[tuple[str, str, list[ParsingWarning]]] = [
+    ("0 HEAD\n\n0 TRLR", "0 HEAD\n0 TRLR", [EmptyLineWarning(2)]),
+    ("1 CHAR UTF-8\n0 TRLR", "0 TRLR", [LevelInconsistencyWarning(1, "1 CHAR UTF-8\n")]),
+    ("0 HEAD\n2 CHAR UTF-8\n0 TRLR", "0 HEAD\n2 CHAR UTF-8\n0 TRLR", [LevelInconsistencyWarning(2, "2 CHAR UTF-8\n")]),
+    ("0 HEAD\n1 NOTE foo\nbar\n0 TRLR", "0 HEAD\n1 NOTE foo\n0 TRLR", [LineParsingWarning(3, "bar\n")]),
+    ("0 HEAD\n1 NOTE foo\nbar baz\n0 TRLR", "0 HEAD\n1 NOTE foo\n0 TRLR", [LevelParsingWarning(3, "bar baz\n")]),
+    ("0 HEAD\n0 @I1@ INDI\n0 @I1@ INDI\n0 TRLR", "0 HEAD\n0 @I1@ INDI\n0 TRLR", [DuplicateXRefWarning("@I1@")]),
+    ("0 HEAD\n0 \n0 TRLR", "0 HEAD\n0 TRLR", [LineParsingWarning(2, "0 \n")]),
+    ("0 HEAD\n1 \n0 TRLR", "0 HEAD\n0 TRLR", [LineParsingWarning(2, "1 \n")]),
+    ("0 HEAD\n\t\n1 NOTE foo\n0 TRLR", "0 HEAD\n1 NOTE foo\n0 TRLR", [EmptyLineWarning(2)]),
+    ("0 HEAD\n \t \n1 NOTE foo\n0 TRLR", "0 HEAD\n1 NOTE foo\n0 TRLR", [EmptyLineWarning(2)]),
+]
+"""Warning tests: malformed gedcom, gedcom of the expected document, expected warnings."""
+
+_GOOD_DOCUMENTS = {good_gedcom: parse(_src(good_gedcom))[0] for _, good_gedcom, _ in _WARNING_CASES}
+"""Documents expected from the warning tests, by gedcom text. Parsed once."""
 
 
 class TestParser(unittest.TestCase):
     def test_parsing(self) -> None:
-        g, w = parse(gedcom_file_data.splitlines())
+        g, w = parse(_src(gedcom_file_data))
         self.assertListEqual(w, [])
         self.assertEqual(g["@I1@"].get_sub_line_payload("NAME"), "éàç /ÉÀÇ/")
         self.assertEqual(g.get_source(), gedcom_file_data)
 
-    def test_parsing_utf8(self) -> None:
-        encoding = "utf-8"
-        file = test_file_dir / "in_utf8.ged"
-        guess = guess_encoding(file)
-        self.assertEqual(guess, encoding)
-        with open(file, "r", encoding=encoding) as f:
-            g, w = parse(f)
+    def test_parsing_encodings(self) -> None:
+        for file_name, encoding, name, source in _ENCODED_FILES:
+            with self.subTest(file=file_name):
+                if encoding == "ansi" and not platform.startswith("win"):
+                    self.skipTest("The ansi encoding is only available on Windows")
+                if encoding == "gedcom" and not IS_ANSEL_INSTALLED:
+                    self.skipTest("The ansel package isn't installed")
+                # newline=None translates the line endings, as open() does in text mode
+                g, w = parse(StringIO(_FILE_BYTES[file_name].decode(encoding), newline=None))
+                self.assertListEqual(w, [])
+                if isinstance(name, bytes):
+                    name = name.decode(encoding)
+                self.assertEqual(g["@I1@"].get_sub_line_payload("NAME"), name)
+                if source is not None:
+                    self.assertEqual(g.get_source(), source)
+
+    def test_guess_encoding(self) -> None:
+        for file_name, encoding, _, _ in _ENCODED_FILES:
+            with self.subTest(file=file_name):
+                self.assertEqual(guess_encoding(test_file_dir / file_name), encoding)
+
+    def test_guess_encoding_read_size(self) -> None:
+        header = b"0 HEAD\n1 GEDC\n2 VERS 5.5\n1 CHAR UTF-8\n"
+        data = header + b"0 @I1@ INDI\n1 NAME John /Doe/\n" * 10000 + b"0 TRLR\n"
+        read_sizes: list[int | None] = []
+        with patch('fastgedcom.parser.open', side_effect=lambda *_: _ReadRecorder(data, read_sizes)):
+            self.assertEqual(guess_encoding("fake file for mock"), "utf-8")
+        self.assertTrue(all(size is not None and 0 < size <= 4096 for size in read_sizes), read_sizes)
+        self.assertLessEqual(sum(size for size in read_sizes if size is not None), 2 * 4096)
+
+    def test_guess_encoding_header_only(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            file = Path(tmp_dir) / "no_char.ged"
+            file.write_text("0 HEAD\n1 GEDC\n2 VERS 5.5\n0 @I1@ INDI\n1 CHAR UTF-8\n0 TRLR\n")
+            self.assertIsNone(guess_encoding(file))
+
+    def test_guess_encoding_line_endings(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            file = Path(tmp_dir) / "cr.ged"
+            file.write_bytes(b"0 HEAD\r1 GEDC\r2 VERS 5.5\r1 CHAR ANSEL\r0 TRLR\r")
+            self.assertEqual(guess_encoding(file), "gedcom")
+            file.write_bytes(b"0 HEAD\r\n1 CHAR ASCII\r\n0 TRLR\r\n")
+            self.assertEqual(guess_encoding(file), "ascii")
+            file.write_bytes(b"0 HEAD\n1 CHAR UTF-8")
+            self.assertEqual(guess_encoding(file), "utf-8")
+
+    def test_guess_encoding_leading_blank_line(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            file = Path(tmp_dir) / "blank.ged"
+            file.write_bytes(b"\n0 HEAD\n1 CHAR ANSI\n0 TRLR\n")
+            self.assertEqual(guess_encoding(file), "ansi")
+            file.write_bytes(b"\r\n\r\n0 HEAD\r\n1 GEDC\r\n1 CHAR ASCII\r\n0 @I1@ INDI\r\n1 CHAR UTF-8\r\n")
+            self.assertEqual(guess_encoding(file), "ascii")
+
+    def test_parsing_list(self) -> None:
+        g, w = parse(_GEDCOM_LINES)
         self.assertListEqual(w, [])
         self.assertEqual(g["@I1@"].get_sub_line_payload("NAME"), "éàç /ÉÀÇ/")
         self.assertEqual(g.get_source(), gedcom_file_data)
 
-    def test_parsing_utf8_bom(self) -> None:
-        encoding = "utf-8-sig"
-        file = test_file_dir / "in_utf8_bom.ged"
-        guess = guess_encoding(file)
-        self.assertEqual(guess, encoding)
-        with open(file, "r", encoding=encoding) as f:
-            g, w = parse(f)
-        self.assertListEqual(w, [])
-        self.assertEqual(g["@I1@"].get_sub_line_payload("NAME"), "éàç /ÉÀÇ/")
+    def test_parsing_trailing_spaces(self) -> None:
+        g, w = parse(_src("0 HEAD\r\n1 NOTE This text is \r\n2 CONC split \r\n2 CONC at spaces\r\n  \n0 TRLR\n"))
+        self.assertListEqual(w, [EmptyLineWarning(5)])
+        self.assertEqual(g["HEAD"].get_sub_line("NOTE").payload_with_cont, "This text is split at spaces")
 
-    def test_parsing_unicode(self) -> None:
-        encoding = "utf_16"
-        file = test_file_dir / "in_unicode.ged"
-        guess = guess_encoding(file)
-        self.assertEqual(guess, encoding)
-        with open(file, "r", encoding=encoding) as f:
-            g, w = parse(f)
+    def test_parsing_trailing_spaces_structured(self) -> None:
+        g, w = parse(_src("0 @F1@ FAM \n1 HUSB @I2@ \n1 NOTE @ \n0 @N1@ NOTE some text \n0 TRLR\n"))
         self.assertListEqual(w, [])
-        self.assertEqual(g["@I1@"].get_sub_line_payload("NAME"), "éàç /ÉÀÇ/")
+        self.assertEqual(g.records["@F1@"].payload, "FAM")
+        self.assertEqual(g["@F1@"].get_sub_line_payload("HUSB"), "@I2@")
+        self.assertEqual(g["@F1@"].get_sub_line_payload("NOTE"), "@")
+        self.assertEqual(g.records["@N1@"].payload, "NOTE some text ")
 
-    def test_parsing_ansi(self) -> None:
-        encoding = "ansi"
-        file = test_file_dir / "in_ansi.ged"
-        guess = guess_encoding(file)
-        self.assertEqual(guess, encoding)
-        if not platform.startswith("win"):
-            self.skipTest("The ansi encoding is only available on Windows")
-        with open(file, "r", encoding=encoding) as f:
-            g, w = parse(f)
-        self.assertListEqual(w, [])
-        self.assertEqual(g["@I1@"].get_sub_line_payload("NAME"), "éàç /ÉÀÇ/")
+    def test_parsing_double_space(self) -> None:
+        # an empty tag isn't valid gedcom, the line is dropped
+        g, w = parse(_src("0 HEAD\n1  NAME John\n0 TRLR\n"))
+        self.assertListEqual(w, [LineParsingWarning(2, "1  NAME John\n")])
+        self.assertEqual(g, _GOOD_DOCUMENTS["0 HEAD\n0 TRLR"])
 
-    def test_parsing_ansel(self) -> None:
-        encoding = "gedcom"
-        file = test_file_dir / "in_ansel.ged"
-        guess = guess_encoding(file)
-        self.assertEqual(guess, encoding)
-        if not IS_ANSEL_INSTALLED:
-            self.skipTest("The ansel package isn't installed")
-        with open(file, "r", encoding=encoding) as f:
-            g, w = parse(f)
-        self.assertListEqual(w, [])
-        name = g["@I1@"].get_sub_line_payload("NAME")
-        self.assertEqual(name, b'\xe2e\xe1a\xf0c /\xe2E\xe1A\xf0C/'.decode("gedcom"))
-
-    def test_parsing_latin1(self) -> None:
-        encoding = "iso8859-1"
-        file = test_file_dir / "in_iso8859-1.ged"
-        guess = guess_encoding(file)
-        self.assertEqual(guess, encoding)
-        with open(file, "r", encoding=encoding) as f:
-            g, w = parse(f)
-        self.assertListEqual(w, [])
-        self.assertEqual(g["@I1@"].get_sub_line_payload("NAME"), "éàç /ÉÀÇ/")
+    def test_iter_records(self) -> None:
+        warnings: list[ParsingWarning] = []
+        records = list(iter_records(_src(gedcom_file_data), warnings))
+        self.assertListEqual(warnings, [])
+        self.assertEqual([r.tag for r in records], ["HEAD", "@I1@", "TRLR"])
+        self.assertEqual(records[1].get_sub_line_payload("NAME"), "éàç /ÉÀÇ/")
+        self.assertEqual("".join(r.get_source() for r in records), gedcom_file_data)
 
-    def test_parsing_string_io(self) -> None:
-        g, w = parse(StringIO(gedcom_file_data))
-        self.assertListEqual(w, [])
+    def test_iter_records_lazy(self) -> None:
+        read_lines: list[str] = []
+
+        def lines() -> Iterator[str]:
+            for line in _src(gedcom_file_data):
+                read_lines.append(line)
+                yield line
+
+        records = iter_records(lines())
+        self.assertEqual(read_lines, [])
+        self.assertEqual(next(records).tag, "HEAD")
+        # only the first line of the next record is read
+        self.assertEqual(read_lines[-1], "0 @I1@ INDI\n")
+        self.assertEqual(next(records).tag, "@I1@")
+        self.assertEqual(read_lines[-1], "0 TRLR\n")
+
+    def test_iter_records_warnings(self) -> None:
+        warnings: list[ParsingWarning] = []
+        records = list(iter_records(_src("0 HEAD\n0 @I1@ INDI\n\n0 @I1@ INDI\n0 TRLR"), warnings))
+        self.assertEqual([r.tag for r in records], ["HEAD", "@I1@", "@I1@", "TRLR"])
+        self.assertEqual(warnings, [EmptyLineWarning(3), DuplicateXRefWarning("@I1@")])
+
+    def test_parsing_interned_xrefs(self) -> None:
+        g, w = parse(_src("0 @I1@ INDI\n1 FAMS @F1@\n0 @F1@ FAM\n1 HUSB @I1@"))
+        self.assertEqual(w, [])
+        self.assertIs(g.records["@I1@"].tag, g["@F1@"].get_sub_line_payload("HUSB"))
+        self.assertIs(g.records["@F1@"].tag, g["@I1@"].get_sub_line_payload("FAMS"))
+
+    def test_parsing_xrefs_not_interned(self) -> None:
+        xref = "".join(["@UNIQUE", "_XREF@"])  # built at runtime, so not interned by the compiler
+        g, _ = parse(_src(f"0 {xref} INDI\n1 NAME a /b/\n1 ALIA {xref}\n0 TRLR"))
+        self.assertIsNot(intern(xref), g.records[xref].tag)
+        self.assertIs(g.records[xref].sub_lines[1].payload, g.records[xref].tag)
+        self.assertIs(intern("NAME"), g.records[xref].sub_lines[0].tag)
+
+    def test_strict_parse(self) -> None:
+        g = strict_parse(_src(gedcom_file_data))
         self.assertEqual(g["@I1@"].get_sub_line_payload("NAME"), "éàç /ÉÀÇ/")
         self.assertEqual(g.get_source(), gedcom_file_data)
 
-    def test_strict_parse(self) -> None:
-        with patch('fastgedcom.parser.open') as open_mock:
-            mock_open(open_mock, gedcom_file_data)
-            g = strict_parse("fake file for mock")
-            self.assertEqual(g["@I1@"].get_sub_line_payload("NAME"), "éàç /ÉÀÇ/")
-            self.assertEqual(g.get_source(), gedcom_file_data)
+    def test_strict_parse_path(self) -> None:
+        g = strict_parse(test_file_dir / "in_utf8.ged")
+        self.assertEqual(g.get_source(), gedcom_file_data)
+
+    def test_strict_parse_path_like(self) -> None:
+        with scandir(test_file_dir) as entries:
+            entry = next(entry for entry in entries if entry.name == "in_utf8.ged")
+            self.assertEqual(strict_parse(entry).get_source(), gedcom_file_data)
+        file = bytes(test_file_dir / "in_utf8.ged")
+        self.assertEqual(strict_parse(file).get_source(), gedcom_file_data)
 
     def test_CharacterInsteadOfLineWarning(self) -> None:
         g, w = parse("0 HEAD\n0 TRLR")
         self.assertEqual(w, [CharacterInsteadOfLineWarning(1)])
         self.assertEqual(g.records, {})
 
-    def test_EmptyLineWarning(self) -> None:
-        warn_gedcom = "0 HEAD\n\n0 TRLR"
-        good_gedcom = "0 HEAD\n0 TRLR"
-        g, w = parse(warn_gedcom.splitlines())
+    def test_warnings(self) -> None:
+        for warn_gedcom, good_gedcom, warnings in _WARNING_CASES:
+            with self.subTest(warning=type(warnings[0]).__name__, gedcom=warn_gedcom):
+                g, w = parse(_src(warn_gedcom))
+                self.assertEqual(w, warnings)
+                self.assertEqual(g, _GOOD_DOCUMENTS[good_gedcom])
+
+    def test_EmptyLineWarning_whitespace_list(self) -> None:
+        # a 1-character line of whitespace is an empty line, not a sign of an iterable on characters
+        g, w = parse(["0 HEAD", "\t", "1 NOTE foo", "0 TRLR"])
         self.assertEqual(w, [EmptyLineWarning(2)])
-        self.assertEqual(g, parse(good_gedcom.splitlines())[0])
-
-    def test_LevelInconsistencyWarning_no_parent(self) -> None:
-        warn_gedcom = "1 CHAR UTF-8\n0 TRLR"
-        good_gedcom = "0 TRLR"
-        g, w = parse(warn_gedcom.splitlines())
-        self.assertEqual(w, [LevelInconsistencyWarning(1, "1 CHAR UTF-8")])
-        self.assertEqual(g, parse(good_gedcom.splitlines())[0])
-
-    def test_LevelInconsistencyWarning_wrong_parent(self) -> None:
-        warn_gedcom = "0 HEAD\n2 CHAR UTF-8\n0 TRLR"
-        good_gedcom = "0 HEAD\n2 CHAR UTF-8\n0 TRLR"
-        g, w = parse(warn_gedcom.splitlines())
-        self.assertEqual(w, [LevelInconsistencyWarning(2, "2 CHAR UTF-8")])
-        self.assertEqual(g, parse(good_gedcom.splitlines())[0])
-
-    def test_LineParsingWarning(self) -> None:
-        warn_gedcom = "0 HEAD\n1 NOTE foo\nbar\n0 TRLR"
-        good_gedcom = "0 HEAD\n1 NOTE foo\n0 TRLR"
-        g, w = parse(warn_gedcom.splitlines())
-        self.assertEqual(w, [LineParsingWarning(3, "bar")])
-        self.assertEqual(g, parse(good_gedcom.splitlines())[0])
-
-    def test_LevelParsingWarning(self) -> None:
-        warn_gedcom = "0 HEAD\n1 NOTE foo\nbar baz\n0 TRLR"
-        good_gedcom = "0 HEAD\n1 NOTE foo\n0 TRLR"
-        g, w = parse(warn_gedcom.splitlines())
-        self.assertEqual(w, [LevelParsingWarning(3, "bar baz")])
-        self.assertEqual(g, parse(good_gedcom.splitlines())[0])
-
-    def test_DuplicateXRefWarning(self) -> None:
-        warn_gedcom = "0 HEAD\n0 @I1@ INDI\n0 @I1@ INDI\n0 TRLR"
-        good_gedcom = "0 HEAD\n0 @I1@ INDI\n0 TRLR"
-        g, w = parse(warn_gedcom.splitlines())
-        self.assertEqual(w, [DuplicateXRefWarning("@I1@")])
-        self.assertEqual(g, parse(good_gedcom.splitlines())[0])
+        self.assertEqual(g, _GOOD_DOCUMENTS["0 HEAD\n1 NOTE foo\n0 TRLR"])
+
+    def test_LevelInconsistencyWarning_skipped_level(self) -> None:
+        warn_gedcom = "0 HEAD\n2 CHAR UTF-8\n3 VERS 1\n1 GEDC\n2 VERS 5.5\n0 TRLR"
+        g, w = parse(_src(warn_gedcom))
+        self.assertEqual(w, [LevelInconsistencyWarning(2, "2 CHAR UTF-8\n")])
+        self.assertEqual(g["HEAD"].get_source(), "0 HEAD\n2 CHAR UTF-8\n3 VERS 1\n1 GEDC\n2 VERS 5.5\n")
+        self.assertEqual([line.tag for line in g["HEAD"]], ["CHAR", "GEDC"])
+
+    def test_LevelInconsistencyWarning_huge_level(self) -> None:
+        warn_gedcom = "0 HEAD\n1 NOTE call me at\n0612345678 after 6pm\n1 CHAR UTF-8\n0 TRLR"
+        g, w = parse(_src(warn_gedcom))
+        self.assertEqual(w, [LevelInconsistencyWarning(3, "0612345678 after 6pm\n")])
+        self.assertEqual(g["HEAD"].get_sub_line("NOTE").get_sub_lines("after"), [TrueLine(612345678, "after", "6pm")])
+        self.assertEqual([line.tag for line in g["HEAD"]], ["NOTE", "CHAR"])
 
     def test_NothingParsedError(self) -> None:
-        with patch('fastgedcom.parser.open') as open_mock:
-            mock_open(open_mock, "")
-            self.assertRaises(NothingParsedError, strict_parse, "fake path for mock")
+        self.assertRaises(NothingParsedError, strict_parse, _src(""))
 
     def test_MalformedError(self) -> None:
-        with patch('fastgedcom.parser.open') as open_mock:
-            mock_open(open_mock, "0 HEAD\n0 @I1@ INDI\n0 @I1@ INDI\n0 TRLR")
-            with self.assertRaises(MalformedError) as cm:
-                strict_parse("fake path for mock")
-            self.assertEqual(cm.exception.warnings, [DuplicateXRefWarning("@I1@")])
+        with self.assertRaises(MalformedError) as cm:
+            strict_parse(_src("0 HEAD\n0 @I1@ INDI\n0 @I1@ INDI\n0 TRLR"))
+        self.assertEqual(cm.exception.warnings, [DuplicateXRefWarning("@I1@")])
 
 
 if __name__ == '__main__':